@@ -10,8 +10,8 @@ settings = get_settings()
 # Include routes from different modules
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
-# Add development endpoints only in development mode
-if settings.APP_ENV == "development":
+# Add development endpoints only in development mode with authentication disabled
+if settings.APP_ENV == "development" and not settings.AUTH_ENABLED:
     from app.api.routes import dev
     api_router.include_router(dev.router, prefix="/dev", tags=["Development"])
 
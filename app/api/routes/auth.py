@@ -1,20 +1,22 @@
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user, check_admin_role
 from app.db.models import User
+from app.db.repositories.user_repository import UserRepository
 from app.db.session import get_db
 from app.schemas.tenant import TenantCreate, TenantResponse
-from app.schemas.user import UserCreate, UserResponse, UserUpdate, CurrentUser, UserStatusUpdate
+from app.schemas.user import UserCreate, UserPage, UserUpdate, CurrentUser, UserStatusUpdate
 from app.services.auth_service import AuthService
 
 router = APIRouter()
 
 
 @router.post("/signup", response_model=dict)
-async def signup_tenant(
+def signup_tenant(
     tenant_data: TenantCreate,
     user_data: UserCreate,
     db: Session = Depends(get_db)
@@ -31,7 +33,7 @@ async def signup_tenant(
         )
         
     auth_service = AuthService(db)
-    result = await auth_service.create_tenant_with_admin(
+    result = auth_service.create_tenant_with_admin(
         tenant_data=tenant_data,
         user_data=user_data,
         cognito_id=user_data.cognito_id
@@ -47,7 +49,7 @@ async def signup_tenant(
 
 
 @router.post("/users", response_model=dict)
-async def add_user(
+def add_user(
     user_data: UserCreate,
     current_user: User = Depends(check_admin_role),
     db: Session = Depends(get_db)
@@ -64,7 +66,7 @@ async def add_user(
         )
         
     auth_service = AuthService(db)
-    result = await auth_service.add_user_to_tenant(
+    result = auth_service.add_user_to_tenant(
         tenant_id=current_user.tenant_id,
         user_data=user_data,
         cognito_id=user_data.cognito_id
@@ -85,32 +87,46 @@ async def get_current_user_info(
 ):
     """
     Get information about the currently authenticated user
+    Returned as a prebuilt response; the fields come from the already-validated
+    user, so response-model validation is skipped
     """
-    return current_user
+    return ORJSONResponse({
+        "email": current_user.email,
+        "first_name": current_user.first_name,
+        "last_name": current_user.last_name,
+        "tenant_id": current_user.tenant_id,
+        "role": current_user.role,
+        "status": current_user.status
+    })
 
 
-@router.get("/users", response_model=List[UserResponse])
-async def list_tenant_users(
-    skip: int = 0,
+@router.get("/users", response_model=UserPage, response_class=ORJSONResponse)
+def list_tenant_users(
+    after_id: Optional[int] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all users in the current tenant
+    List users in the current tenant, one page at a time.
+    Pass the returned next_after_id as after_id to fetch the following page;
+    it is null on the last page.
+    Rows are serialized directly, bypassing ORM hydration and response validation
     """
-    from app.db.repositories.user_repository import UserRepository
     user_repo = UserRepository(db)
-    users = user_repo.get_by_tenant(
+    rows = user_repo.get_rows_by_tenant(
         tenant_id=current_user.tenant_id,
-        skip=skip,
+        after_id=after_id,
         limit=limit
     )
-    return users
+    return ORJSONResponse({
+        "items": [row._asdict() for row in rows],
+        "next_after_id": rows[-1].id if rows and len(rows) == limit else None
+    })
 
 
 @router.patch("/users/{user_id}", response_model=dict)
-async def update_user_info(
+def update_user_info(
     user_id: int,
     user_update: UserUpdate,
     current_user: User = Depends(check_admin_role),
@@ -121,7 +137,6 @@ async def update_user_info(
     Only administrators can update user information.
     """
     # Check if user belongs to the same tenant as admin
-    from app.db.repositories.user_repository import UserRepository
     user_repo = UserRepository(db)
     user = user_repo.get_by_id(user_id)
     
@@ -132,7 +147,7 @@ async def update_user_info(
         )
         
     auth_service = AuthService(db)
-    result = await auth_service.update_user(user_id, user_update)
+    result = auth_service.update_user(user_id, user_update)
     
     if "error" in result:
         raise HTTPException(
@@ -144,7 +159,7 @@ async def update_user_info(
 
 
 @router.patch("/users/status/{cognito_id}", response_model=dict)
-async def update_user_status(
+def update_user_status(
     cognito_id: str,
     status_update: UserStatusUpdate,
     current_user: User = Depends(check_admin_role),
@@ -156,7 +171,7 @@ async def update_user_status(
     after they confirm their email address.
     """
     auth_service = AuthService(db)
-    result = await auth_service.update_user_status_by_cognito_id(cognito_id, status_update)
+    result = auth_service.update_user_status_by_cognito_id(cognito_id, status_update)
     
     if "error" in result:
         raise HTTPException(
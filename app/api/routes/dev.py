@@ -1,25 +1,40 @@
 """
 Development and testing utility endpoints
-These endpoints are only enabled in development mode
+These endpoints are only enabled in development mode with AUTH_ENABLED False
 """
 import uuid
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
+from app.core.auth import clear_mock_user_cache
 from app.core.config import get_settings
 from app.db.models import BusinessType, Tenant, User, UserRole, UserStatus
 from app.db.repositories.tenant_repository import TenantRepository
 from app.db.repositories.user_repository import UserRepository
-from app.db.session import get_db
+from app.db.session import get_db, get_db_ro
 from app.schemas.tenant import TenantCreate, TenantResponse
-from app.schemas.user import UserResponse
+from app.schemas.user import UserPage
 
 settings = get_settings()
+AUTH_ENABLED = settings.AUTH_ENABLED
 
-# Only create router if in development mode
-router = APIRouter()
+
+def require_auth_disabled():
+    """
+    Dependency that rejects requests while AUTH_ENABLED is True
+    """
+    if AUTH_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint is only available when AUTH_ENABLED is False"
+        )
+
+
+# Only create router if in development mode; every endpoint requires auth to be disabled
+router = APIRouter(dependencies=[Depends(require_auth_disabled)])
 
 @router.get("/check", response_model=Dict)
 async def check_dev_mode():
@@ -28,12 +43,12 @@ async def check_dev_mode():
     """
     return {
         "dev_mode": settings.APP_ENV == "development",
-        "auth_disabled": not settings.AUTH_ENABLED,
+        "auth_disabled": not AUTH_ENABLED,
         "app_env": settings.APP_ENV
     }
 
 @router.post("/create-test-tenant", response_model=Dict)
-async def create_test_tenant(
+def create_test_tenant(
     business_name: str = "Test Company",
     email: str = "test@example.com",
     business_type: BusinessType = BusinessType.LLC, 
@@ -43,14 +58,9 @@ async def create_test_tenant(
     Create a test tenant with an admin user
     Only available when AUTH_ENABLED is False
     """
-    if settings.AUTH_ENABLED:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This endpoint is only available when AUTH_ENABLED is False"
-        )
-    
     try:
-        # Create tenant
+        # Create tenant and admin user in a single transaction; linking them via
+        # the relationship lets SQLAlchemy order the inserts and fill tenant_id
         tenant = Tenant(
             business_name=business_name,
             business_type=business_type,
@@ -58,11 +68,6 @@ async def create_test_tenant(
             estimated_invoices_monthly=100
         )
         
-        db.add(tenant)
-        db.commit()
-        db.refresh(tenant)
-        
-        # Create admin user
         user = User(
             email=email,
             first_name="Admin",
@@ -70,12 +75,12 @@ async def create_test_tenant(
             role=UserRole.ADMIN,
             status=UserStatus.ACTIVE,
             cognito_id=f"dev-{uuid.uuid4()}",
-            tenant_id=tenant.id
+            tenant=tenant
         )
         
-        db.add(user)
+        db.add_all([tenant, user])
         db.commit()
-        db.refresh(user)
+        clear_mock_user_cache()
         
         return {
             "success": True,
@@ -99,40 +104,30 @@ async def create_test_tenant(
             detail=f"Failed to create test tenant: {str(e)}"
         )
 
-@router.get("/tenants", response_model=List[TenantResponse])
-async def list_all_tenants(
+@router.get("/tenants", response_model=List[TenantResponse], response_class=ORJSONResponse)
+def list_all_tenants(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_ro)
 ):
     """
     List all tenants in the system
     Only available when AUTH_ENABLED is False
     """
-    if settings.AUTH_ENABLED:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This endpoint is only available when AUTH_ENABLED is False"
-        )
-    
     tenant_repo = TenantRepository(db)
-    return tenant_repo.get_all(skip=skip, limit=limit)
+    return [row._asdict() for row in tenant_repo.get_rows(skip=skip, limit=limit)]
 
-@router.get("/tenants/{tenant_id}/users", response_model=List[UserResponse])
-async def list_tenant_users(
+@router.get("/tenants/{tenant_id}/users", response_model=UserPage, response_class=ORJSONResponse)
+def list_tenant_users(
     tenant_id: str,
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = None,
+    limit: int = 100,
+    db: Session = Depends(get_db_ro)
 ):
     """
-    List all users for a specific tenant
+    List users for a specific tenant, one page at a time
     Only available when AUTH_ENABLED is False
     """
-    if settings.AUTH_ENABLED:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This endpoint is only available when AUTH_ENABLED is False"
-        )
-    
     # Verify tenant exists
     tenant_repo = TenantRepository(db)
     tenant = tenant_repo.get_by_id(tenant_id)
@@ -145,4 +140,8 @@ async def list_tenant_users(
     
     # Get users for the tenant
     user_repo = UserRepository(db)
-    return user_repo.get_by_tenant(tenant_id=tenant_id)
+    rows = user_repo.get_rows_by_tenant(tenant_id=tenant_id, after_id=after_id, limit=limit)
+    return ORJSONResponse({
+        "items": [row._asdict() for row in rows],
+        "next_after_id": rows[-1].id if rows and len(rows) == limit else None
+    })
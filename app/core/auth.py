@@ -1,26 +1,35 @@
 """
 Authentication dependencies and utilities for FastAPI
 """
-import json
+import asyncio
 import logging
 import time
-from typing import Dict, Optional, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Optional
 
-import jwt
-import requests
+import httpx
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jwt.algorithms import RSAAlgorithm
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.core.lazy_import import lazy_import
 from app.db.models import User, UserRole, UserStatus
 from app.db.repositories.user_repository import UserRepository
 from app.db.session import get_db
 
+# PyJWT is only loaded once a token is validated, so deployments running
+# with AUTH_ENABLED False never import it
+jwt = lazy_import("jwt")
+
 # Get application settings
 settings = get_settings()
 
+# Hot-path settings bound once at import
+AUTH_ENABLED = settings.AUTH_ENABLED
+_ADMIN = UserRole.ADMIN
+
 # Setup authentication scheme
 security = HTTPBearer(auto_error=False)
 
@@ -30,50 +39,102 @@ logging_level = getattr(logging, settings.LOG_LEVEL)
 logger.setLevel(logging_level)
 
 # Cache for JWK keys - to avoid fetching on every request
+# Maps kid -> (raw JWK dict, parsed public key)
 jwk_keys: Dict = {}
-last_jwk_fetch = 0
+jwk_etag: Optional[str] = None
+last_jwk_fetch = 0.0
 JWK_CACHE_DURATION = 3600  # 1 hour
 
+# Token validation parameters, built once rather than per request
+_JWT_ALGS = ("RS256",)
+_JWT_AUDIENCE = settings.AWS_COGNITO_CLIENT_ID
+_JWT_OPTIONS = MappingProxyType({
+    "verify_exp": True,
+    "verify_aud": True,
+    "require": ("exp", "sub", "aud"),
+})
 
-def get_jwk_keys():
+# Shared HTTP client (keeps the TLS connection to Cognito alive, retrying failed
+# connects) and a lock so only one coroutine refreshes the JWK cache at a time
+_http = httpx.AsyncClient(timeout=5.0, transport=httpx.AsyncHTTPTransport(retries=2))
+_jwk_lock = asyncio.Lock()
+
+@lru_cache(maxsize=32)
+def _parse_jwk(kid: str, n: str, e: str):
+    """
+    Build the RSA public key for a JWK
+    Keyed on the key material, so rotated keys are parsed once and reused
+    """
+    return jwt.PyJWK({"kty": "RSA", "kid": kid, "n": n, "e": e}, algorithm="RS256").key
+
+
+def _jwk_cache_valid() -> bool:
+    return bool(jwk_keys) and time.monotonic() - last_jwk_fetch < JWK_CACHE_DURATION
+
+
+async def get_jwk_keys():
     """
     Fetch the JSON Web Keys from AWS Cognito for JWT validation
     Caches the keys to avoid frequent requests
     """
-    global jwk_keys, last_jwk_fetch
+    global jwk_keys, jwk_etag, last_jwk_fetch
     
     # Return cached keys if they're still valid
-    if jwk_keys and time.time() - last_jwk_fetch < JWK_CACHE_DURATION:
+    if _jwk_cache_valid():
         logger.debug("Using cached JWK keys")
         return jwk_keys
         
-    # Fetch keys from Cognito
-    jwk_url = f"https://cognito-idp.{settings.AWS_COGNITO_REGION}.amazonaws.com/{settings.AWS_COGNITO_USER_POOL_ID}/.well-known/jwks.json"
-    
-    try:
-        logger.info(f"Fetching JWK keys from: {jwk_url}")
-        response = requests.get(jwk_url)
-        response.raise_for_status()
-        keys = response.json().get('keys', [])
-        
-        # Update the cache
-        jwk_keys = {key['kid']: key for key in keys}
-        last_jwk_fetch = time.time()
-        logger.info(f"Successfully fetched {len(jwk_keys)} JWK keys")
+    async with _jwk_lock:
+        # Another coroutine may have refreshed the keys while we were waiting
+        if _jwk_cache_valid():
+            return jwk_keys
+            
+        # Fetch keys from Cognito
+        jwk_url = f"https://cognito-idp.{settings.AWS_COGNITO_REGION}.amazonaws.com/{settings.AWS_COGNITO_USER_POOL_ID}/.well-known/jwks.json"
         
-        return jwk_keys
-    except requests.exceptions.ConnectionError as e:
-        logger.error(f"Connection error fetching JWK keys: {str(e)}")
-        return {}
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"HTTP error fetching JWK keys: {str(e)}")
-        return {}
-    except Exception as e:
-        logger.error(f"Unexpected error fetching JWK keys: {str(e)}")
-        return {}
+        try:
+            logger.info(f"Fetching JWK keys from: {jwk_url}")
+            # Revalidate with the previous ETag; an unchanged key set skips the JSON parse
+            headers = {"If-None-Match": jwk_etag} if jwk_keys and jwk_etag else None
+            response = await _http.get(jwk_url, headers=headers)
+            
+            if response.status_code == 304:
+                last_jwk_fetch = time.monotonic()
+                logger.info("JWK keys not modified")
+                return jwk_keys
+                
+            response.raise_for_status()
+            keys = response.json().get('keys', [])
+            
+            # Update the cache
+            jwk_keys = {
+                key['kid']: (key, _parse_jwk(key['kid'], key['n'], key['e']))
+                for key in keys
+            }
+            jwk_etag = response.headers.get("ETag")
+            last_jwk_fetch = time.monotonic()
+            logger.info(f"Successfully fetched {len(jwk_keys)} JWK keys")
+            
+            return jwk_keys
+        except httpx.TransportError as e:
+            logger.error(f"Connection error fetching JWK keys: {str(e)}")
+            return {}
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error fetching JWK keys: {str(e)}")
+            return {}
+        except Exception as e:
+            logger.error(f"Unexpected error fetching JWK keys: {str(e)}")
+            return {}
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client used for JWK fetches
+    """
+    await _http.aclose()
 
 
-def validate_token(token: str) -> Dict:
+async def validate_token(token: str) -> Dict:
     """
     Validate a JWT token from AWS Cognito
     """
@@ -97,7 +158,7 @@ def validate_token(token: str) -> Dict:
             )
         
         # Fetch the JWK keys
-        keys = get_jwk_keys()
+        keys = await get_jwk_keys()
         if not keys:
             logger.error("No JWK keys available for validation")
             raise HTTPException(
@@ -112,16 +173,16 @@ def validate_token(token: str) -> Dict:
                 detail="Invalid token signature",
             )
             
-        # Get the public key for validation
-        public_key = RSAAlgorithm.from_jwk(json.dumps(keys[kid]))
+        # Get the pre-parsed public key for validation
+        public_key = keys[kid][1]
         
         # Validate the token
         payload = jwt.decode(
             token,
             public_key,
-            algorithms=['RS256'],
-            audience=settings.AWS_COGNITO_CLIENT_ID,
-            options={"verify_exp": True}
+            algorithms=_JWT_ALGS,
+            audience=_JWT_AUDIENCE,
+            options=_JWT_OPTIONS
         )
         
         logger.debug(f"Token validated successfully for subject: {payload.get('sub', 'unknown')}")
@@ -152,17 +213,37 @@ def validate_token(token: str) -> Dict:
         )
 
 
+# Development user returned while AUTH_ENABLED is False, looked up once
+_mock_user_cache: Optional[User] = None
+
+
+def clear_mock_user_cache() -> None:
+    """
+    Forget the cached development user so the next request looks it up again
+    """
+    global _mock_user_cache
+    _mock_user_cache = None
+
+
 def create_mocked_user(db: Session) -> User:
     """
     Create a mocked user for development when AUTH_ENABLED is False
     """
+    global _mock_user_cache
+    
+    if _mock_user_cache is not None and _mock_user_cache.id is not None:
+        return _mock_user_cache
+        
     # Try to get an existing admin user
     user_repo = UserRepository(db)
     users = user_repo.get_all(limit=1)
     
     if users:
-        # Return the first user if available
-        return users[0]
+        # Cache the first user, detached so it stays usable across sessions
+        user = users[0]
+        db.expunge(user)
+        _mock_user_cache = user
+        return user
     else:
         # If no users exist, this is likely a fresh database
         # Return a mocked user object without saving to DB
@@ -180,19 +261,17 @@ def create_mocked_user(db: Session) -> User:
         )
 
 
-async def get_current_user(
+async def get_token_payload(
     request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> Optional[Dict]:
     """
-    Dependency to get the current authenticated user
-    When AUTH_ENABLED is False, returns a development user
+    Dependency to validate the bearer token and return its claims
+    Runs on the event loop so the JWK fetch never ties up a worker thread.
+    When AUTH_ENABLED is False, returns None
     """
-    # If authentication is disabled, return mock user
-    if not settings.AUTH_ENABLED:
-        logger.info(f"Auth disabled: Using mock user for request to {request.url.path}")
-        return create_mocked_user(db)
+    if not AUTH_ENABLED:
+        return None
     
     # Check if credentials are provided
     if not credentials:
@@ -204,8 +283,23 @@ async def get_current_user(
         )
     
     # Validate the token
-    token = credentials.credentials
-    payload = validate_token(token)
+    return await validate_token(credentials.credentials)
+
+
+def get_current_user(
+    request: Request,
+    payload: Optional[Dict] = Depends(get_token_payload),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user
+    Declared sync so the database lookup runs in the threadpool.
+    When AUTH_ENABLED is False, returns a development user
+    """
+    # If authentication is disabled, return mock user
+    if not AUTH_ENABLED:
+        logger.info(f"Auth disabled: Using mock user for request to {request.url.path}")
+        return create_mocked_user(db)
     
     # Extract Cognito user ID
     cognito_id = payload.get('sub')
@@ -216,7 +310,7 @@ async def get_current_user(
             detail="Invalid user identity in token",
         )
         
-    # Get user from database
+    # Get user from database (served from the repository's user cache when warm)
     user_repo = UserRepository(db)
     user = user_repo.get_by_cognito_id(cognito_id)
     
@@ -239,13 +333,32 @@ async def get_current_user(
     return user
 
 
-async def check_admin_role(current_user: User = Depends(get_current_user)) -> User:
+def check_admin_role(current_user: User = Depends(get_current_user)) -> User:
     """
     Dependency to check if the current user has admin role
     """
-    if current_user.role != UserRole.ADMIN:
+    if current_user.role != _ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin role required",
         )
     return current_user
+
+
+def require_roles(*roles: UserRole) -> Callable[..., User]:
+    """
+    Build a dependency that only admits users holding one of the given roles,
+    e.g. Depends(require_roles(UserRole.ADMIN, UserRole.USER))
+    """
+    allowed = frozenset(roles)
+    detail = f"One of the following roles is required: {', '.join(role.value for role in roles)}"
+    
+    def check_roles(current_user: User = Depends(get_current_user)) -> User:
+        if current_user.role not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail,
+            )
+        return current_user
+        
+    return check_roles
@@ -1,54 +1,107 @@
-import os
-from functools import lru_cache
+import hashlib
+from base64 import urlsafe_b64encode
+from functools import cached_property, lru_cache
+from pathlib import Path
 from typing import Optional
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from pydantic import Field, ValidationInfo, computed_field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# .env lives in the project root
+ENV_FILE = Path(__file__).resolve().parents[2] / ".env"
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=ENV_FILE, extra="ignore", frozen=True)
 
-class Settings:
     # App Settings
-    APP_ENV: str = os.getenv("APP_ENV", "development")
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "")
-    API_V1_PREFIX: str = os.getenv("API_V1_PREFIX", "/api/v1")
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    APP_ENV: str = "development"
+    SECRET_KEY: str = ""
+    API_V1_PREFIX: str = "/api/v1"
+    LOG_LEVEL: str = "INFO"
 
     # Database Configuration
-    DB_HOST: str = os.getenv("DB_HOST", "localhost")
-    DB_PORT: int = int(os.getenv("DB_PORT", "3306"))
-    DB_USER: str = os.getenv("DB_USER", "")
-    DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
-    DB_NAME: str = os.getenv("DB_NAME", "")
+    DB_HOST: str = "localhost"
+    DB_PORT: int = 3306
+    DB_USER: str = ""
+    DB_PASSWORD: str = ""
+    DB_NAME: str = ""
+
+    # Database Connection Pool
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 5
+    DB_POOL_RECYCLE: int = 1800
+    DB_ISOLATION_LEVEL: str = "READ COMMITTED"
+    # Run create_all on startup; schema is otherwise managed by Alembic migrations
+    AUTO_CREATE_TABLES: bool = False
+
+    # Worker threads available to sync endpoints and dependencies
+    # Defaults to the pool capacity so threads never queue waiting on a connection
+    THREAD_POOL_SIZE: Optional[int] = Field(default=None, validate_default=True)
 
     # Encryption
-    ENCRYPTION_KEY: str = os.getenv("ENCRYPTION_KEY", "")
+    ENCRYPTION_KEY: str = ""
+    # Comma-separated Fernet keys, newest first; older keys are kept for decryption during rotation
+    ENCRYPTION_KEYS: Optional[str] = Field(default=None, validate_default=True)
 
     # AWS Cognito Settings
-    AWS_COGNITO_REGION: str = os.getenv("AWS_COGNITO_REGION", "us-east-1")
-    AWS_COGNITO_USER_POOL_ID: str = os.getenv("AWS_COGNITO_USER_POOL_ID", "")
-    AWS_COGNITO_CLIENT_ID: str = os.getenv("AWS_COGNITO_CLIENT_ID", "")
-    
+    AWS_COGNITO_REGION: str = "us-east-1"
+    AWS_COGNITO_USER_POOL_ID: str = ""
+    AWS_COGNITO_CLIENT_ID: str = ""
+
     # Authentication Settings
-    AUTH_ENABLED: bool = os.getenv("AUTH_ENABLED", "true").lower() == "true"
+    AUTH_ENABLED: bool = True
 
     # Zoho Integration
-    ZOHO_CLIENT_ID: Optional[str] = os.getenv("ZOHO_CLIENT_ID")
-    ZOHO_CLIENT_SECRET: Optional[str] = os.getenv("ZOHO_CLIENT_SECRET")
-    ZOHO_REDIRECT_URI: Optional[str] = os.getenv("ZOHO_REDIRECT_URI")
-    ZOHO_TOKEN_URL: str = os.getenv("ZOHO_TOKEN_URL", "https://accounts.zoho.in/oauth/v2/token")
+    ZOHO_CLIENT_ID: Optional[str] = None
+    ZOHO_CLIENT_SECRET: Optional[str] = None
+    ZOHO_REDIRECT_URI: Optional[str] = None
+    ZOHO_TOKEN_URL: str = "https://accounts.zoho.in/oauth/v2/token"
 
     # QuickBooks Integration
-    QUICKBOOKS_CLIENT_ID: Optional[str] = os.getenv("QUICKBOOKS_CLIENT_ID")
-    QUICKBOOKS_CLIENT_SECRET: Optional[str] = os.getenv("QUICKBOOKS_CLIENT_SECRET")
-    QUICKBOOKS_REDIRECT_URI: Optional[str] = os.getenv("QUICKBOOKS_REDIRECT_URI")
-    QUICKBOOKS_TOKEN_URL: Optional[str] = os.getenv("QUICKBOOKS_TOKEN_URL")
+    QUICKBOOKS_CLIENT_ID: Optional[str] = None
+    QUICKBOOKS_CLIENT_SECRET: Optional[str] = None
+    QUICKBOOKS_REDIRECT_URI: Optional[str] = None
+    QUICKBOOKS_TOKEN_URL: Optional[str] = None
 
     # Xero Integration
-    XERO_CLIENT_ID: Optional[str] = os.getenv("XERO_CLIENT_ID")
-    XERO_CLIENT_SECRET: Optional[str] = os.getenv("XERO_CLIENT_SECRET")
-    XERO_REDIRECT_URI: Optional[str] = os.getenv("XERO_REDIRECT_URI")
-    XERO_TOKEN_URL: Optional[str] = os.getenv("XERO_TOKEN_URL")
+    XERO_CLIENT_ID: Optional[str] = None
+    XERO_CLIENT_SECRET: Optional[str] = None
+    XERO_REDIRECT_URI: Optional[str] = None
+    XERO_TOKEN_URL: Optional[str] = None
+
+    @field_validator("THREAD_POOL_SIZE")
+    @classmethod
+    def default_thread_pool_size(cls, value: Optional[int], info: ValidationInfo) -> Optional[int]:
+        """Match the threadpool to the database pool capacity unless set explicitly"""
+        pool_size = info.data.get("DB_POOL_SIZE")
+        max_overflow = info.data.get("DB_MAX_OVERFLOW")
+        # Either is missing when it failed its own validation; let that error surface
+        if value is None and pool_size is not None and max_overflow is not None:
+            return pool_size + max_overflow
+        return value
+
+    @field_validator("ENCRYPTION_KEYS")
+    @classmethod
+    def default_encryption_keys(cls, value: Optional[str], info: ValidationInfo) -> Optional[str]:
+        """Fall back to the single ENCRYPTION_KEY when no rotation list is given"""
+        return value or info.data.get("ENCRYPTION_KEY", value)
+
+    @cached_property
+    def fernet_key(self) -> str:
+        """
+        Fernet key for integration token encryption, derived from ENCRYPTION_KEY once
+        Keys that are not 32 bytes are hashed to get a consistent size
+        """
+        key = self.ENCRYPTION_KEY.encode()
+        if not key:
+            raise ValueError("Encryption key not configured")
+        if len(key) != 32:
+            key = hashlib.sha256(key).digest()
+        return urlsafe_b64encode(key).decode()
 
+    @computed_field
     @property
     def database_url(self) -> str:
         """Build SQLAlchemy DATABASE_URL from settings"""
@@ -0,0 +1,26 @@
+"""
+Deferred module imports to keep process start-up cheap
+"""
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module whose real import is deferred until an attribute is first accessed
+    Used for heavy dependencies (JWT) that some deployments never touch
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+        
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+        
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,17 +1,20 @@
-from cryptography.fernet import Fernet
-from typing import Union
+from functools import lru_cache
+from typing import Iterable, List, Union
 
-from app.core.config import get_settings
+from cryptography.fernet import Fernet, MultiFernet
 
-settings = get_settings()
+from app.core.config import get_settings
 
 
 class EncryptionService:
     """
     Service for encrypting and decrypting sensitive data
+    Accepts several comma-separated keys for rotation: data is encrypted with
+    the first key and can be decrypted with any of them
     """
-    def __init__(self, key: str = settings.ENCRYPTION_KEY):
-        self.fernet = Fernet(key.encode() if isinstance(key, str) else key)
+    def __init__(self, key: str):
+        keys = [k.strip() for k in key.split(",") if k.strip()]
+        self.fernet = MultiFernet([Fernet(k.encode()) for k in keys])
     
     def encrypt(self, data: Union[str, bytes]) -> str:
         """
@@ -32,7 +35,43 @@ class EncryptionService:
             
         decrypted_data = self.fernet.decrypt(encrypted_data)
         return decrypted_data.decode()
+    
+    def decrypt_many(self, items: Iterable[Union[str, bytes]]) -> List[str]:
+        """
+        Decrypt a batch of values and return them as strings
+        """
+        decrypt = self.fernet.decrypt
+        return [
+            decrypt(item.encode() if isinstance(item, str) else item).decode()
+            for item in items
+        ]
 
 
-# Create a singleton instance for app-wide use
-encryption_service = EncryptionService()
+@lru_cache(maxsize=1)
+def get_encryption_service() -> EncryptionService:
+    """
+    Returns the app-wide encryption service, built on first use
+    Usable as a FastAPI dependency: Depends(get_encryption_service)
+    """
+    return EncryptionService(get_settings().ENCRYPTION_KEYS)
+
+
+def encrypt(data: Union[str, bytes]) -> str:
+    """
+    Encrypt data with the app-wide encryption service
+    """
+    return get_encryption_service().encrypt(data)
+
+
+def decrypt(encrypted_data: Union[str, bytes]) -> str:
+    """
+    Decrypt data with the app-wide encryption service
+    """
+    return get_encryption_service().decrypt(encrypted_data)
+
+
+def decrypt_many(items: Iterable[Union[str, bytes]]) -> List[str]:
+    """
+    Decrypt a batch of values with the app-wide encryption service
+    """
+    return get_encryption_service().decrypt_many(items)
@@ -3,15 +3,16 @@ from enum import Enum
 import uuid
 from typing import Optional
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Boolean, Text, Enum as SQLAEnum
-from sqlalchemy.dialects.mysql import VARCHAR
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Boolean, Text, LargeBinary, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 # Import Base from session
 from app.db.session import Base
+from app.db.types import GUID, SmallEnum
 
 
+# Enum columns persist each member's position (see SmallEnum), so only append new members
 class IntegrationType(str, Enum):
     ZOHO = "zoho"
     QUICKBOOKS = "quickbooks"
@@ -49,9 +50,9 @@ class Tenant(Base):
     """
     __tablename__ = "tenants"
 
-    id = Column(VARCHAR(36), primary_key=True, default=generate_uuid)
+    id = Column(GUID, primary_key=True, default=generate_uuid)
     business_name = Column(String(255), nullable=False)
-    business_type = Column(SQLAEnum(BusinessType), nullable=False)
+    business_type = Column(SmallEnum(BusinessType), nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     estimated_invoices_monthly = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -67,15 +68,19 @@ class User(Base):
     User model for authentication and authorization
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Serves tenant-scoped keyset pagination (WHERE tenant_id = ? AND id > ? ORDER BY id)
+        Index("ix_users_tenant_id_id", "tenant_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    tenant_id = Column(VARCHAR(36), ForeignKey("tenants.id"), nullable=False)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False)
     cognito_id = Column(String(255), unique=True, nullable=False)
-    email = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
-    role = Column(SQLAEnum(UserRole), nullable=False, default=UserRole.USER)
-    status = Column(SQLAEnum(UserStatus), nullable=False, default=UserStatus.PENDING_CONFIRMATION)
+    role = Column(SmallEnum(UserRole), nullable=False, default=UserRole.USER)
+    status = Column(SmallEnum(UserStatus), nullable=False, default=UserStatus.PENDING_CONFIRMATION)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -88,17 +93,22 @@ class IntegrationKey(Base):
     Model for storing encrypted integration keys (access tokens, refresh tokens)
     """
     __tablename__ = "integration_keys"
+    __table_args__ = (
+        # One key per tenant and integration; also the conflict target for the upsert in create()
+        UniqueConstraint("tenant_id", "integration_type", name="uq_intkey_tenant_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    tenant_id = Column(VARCHAR(36), ForeignKey("tenants.id"), nullable=False)
-    integration_type = Column(SQLAEnum(IntegrationType), nullable=False)
+    tenant_id = Column(GUID, ForeignKey("tenants.id"), nullable=False)
+    integration_type = Column(SmallEnum(IntegrationType), nullable=False)
     
-    # Encrypted tokens
-    access_token = Column(Text, nullable=False)
-    refresh_token = Column(Text, nullable=False)
+    # Encrypted tokens; new rows hold both tokens in access_token and leave refresh_token NULL
+    access_token = Column(LargeBinary, nullable=False)
+    refresh_token = Column(LargeBinary, nullable=True)
     
     # Additional information
     expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at_ts = Column(BigInteger, nullable=False)  # expires_at as UTC epoch seconds, for cheap expiry checks
     org_id = Column(String(255), nullable=True)
     tenant_id_external = Column(String(255), nullable=True)
     additional_data = Column(Text, nullable=True)  # Store as JSON string if needed
@@ -1 +1,5 @@
+from app.db.repositories.integration_repository import IntegrationKeyRepository
+from app.db.repositories.tenant_repository import TenantRepository
+from app.db.repositories.user_repository import UserRepository
 
+__all__ = ["IntegrationKeyRepository", "TenantRepository", "UserRepository"]
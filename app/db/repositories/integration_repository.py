@@ -1,5 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
 
 from app.db.models import IntegrationKey, IntegrationType
@@ -9,6 +11,7 @@ class IntegrationKeyRepository:
     """
     Repository for IntegrationKey CRUD operations
     """
+    __slots__ = ("db",)
     
     def __init__(self, db: Session):
         self.db = db
@@ -16,113 +19,134 @@ class IntegrationKeyRepository:
     def create(self, 
                tenant_id: str, 
                integration_type: IntegrationType,
-               access_token: str,
-               refresh_token: str,
+               access_token: bytes,
+               refresh_token: Optional[bytes],
                expires_at: datetime,
                org_id: Optional[str] = None,
                tenant_id_external: Optional[str] = None,
                additional_data: Optional[str] = None
-            ) -> IntegrationKey:
+            ) -> None:
         """
-        Create a new integration key for a tenant
+        Create or replace the integration key for a tenant and integration type
         """
-        # Check if integration key already exists for this tenant and integration type
-        existing_key = self.get_by_tenant_and_type(tenant_id, integration_type)
-        
-        # If key exists, update it instead of creating a new one
-        if existing_key:
-            existing_key.access_token = access_token
-            existing_key.refresh_token = refresh_token
-            existing_key.expires_at = expires_at
-            existing_key.org_id = org_id
-            existing_key.tenant_id_external = tenant_id_external
-            existing_key.additional_data = additional_data
-            existing_key.updated_at = datetime.now()
-            
-            self.db.commit()
-            self.db.refresh(existing_key)
-            return existing_key
+        # Naive datetimes are stored as UTC wall time
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
             
-        # Create new integration key
-        db_key = IntegrationKey(
+        # Single INSERT ... ON DUPLICATE KEY UPDATE against uq_intkey_tenant_type
+        stmt = mysql_insert(IntegrationKey).values(
             tenant_id=tenant_id,
             integration_type=integration_type,
             access_token=access_token,
             refresh_token=refresh_token,
             expires_at=expires_at,
+            expires_at_ts=int(expires_at.timestamp()),
             org_id=org_id,
             tenant_id_external=tenant_id_external,
             additional_data=additional_data
         )
+        stmt = stmt.on_duplicate_key_update(
+            access_token=stmt.inserted.access_token,
+            refresh_token=stmt.inserted.refresh_token,
+            expires_at=stmt.inserted.expires_at,
+            expires_at_ts=stmt.inserted.expires_at_ts,
+            org_id=stmt.inserted.org_id,
+            tenant_id_external=stmt.inserted.tenant_id_external,
+            additional_data=stmt.inserted.additional_data,
+            # onupdate does not fire for ON DUPLICATE KEY UPDATE, so set it explicitly
+            updated_at=func.now()
+        )
         
-        self.db.add(db_key)
+        self.db.execute(stmt)
         self.db.commit()
-        self.db.refresh(db_key)
-        
-        return db_key
         
     def get_by_id(self, key_id: int) -> Optional[IntegrationKey]:
         """
         Get integration key by ID
         """
-        return self.db.query(IntegrationKey).filter(IntegrationKey.id == key_id).first()
+        return self.db.get(IntegrationKey, key_id)
         
     def get_by_tenant_and_type(self, tenant_id: str, integration_type: IntegrationType) -> Optional[IntegrationKey]:
         """
         Get integration key by tenant ID and integration type
         """
-        return self.db.query(IntegrationKey).filter(
-            IntegrationKey.tenant_id == tenant_id,
-            IntegrationKey.integration_type == integration_type
+        return self.db.execute(
+            select(IntegrationKey)
+            .where(
+                IntegrationKey.tenant_id == tenant_id,
+                IntegrationKey.integration_type == integration_type
+            )
+            .limit(1)
+        ).scalars().first()
+        
+    def get_expiry(self, tenant_id: str, integration_type: IntegrationType) -> Optional[Row]:
+        """
+        Get only the expiry (expires_at, expires_at_ts) of a tenant's integration key
+        Leaves the encrypted token columns unread
+        """
+        return self.db.execute(
+            select(IntegrationKey.expires_at, IntegrationKey.expires_at_ts)
+            .where(
+                IntegrationKey.tenant_id == tenant_id,
+                IntegrationKey.integration_type == integration_type
+            )
         ).first()
         
-    def get_all_by_tenant(self, tenant_id: str) -> List[IntegrationKey]:
+    def get_all_by_tenant(self, tenant_id: str, skip: int = 0, limit: int = 100) -> List[IntegrationKey]:
         """
-        Get all integration keys for a tenant
+        Get integration keys for a tenant
         """
-        return self.db.query(IntegrationKey).filter(
-            IntegrationKey.tenant_id == tenant_id
-        ).all()
+        return self.db.execute(
+            select(IntegrationKey)
+            .where(IntegrationKey.tenant_id == tenant_id)
+            .order_by(IntegrationKey.id)
+            .offset(skip)
+            .limit(limit)
+        ).scalars().all()
         
     def update(self, key_id: int, update_data: Dict[str, Any]) -> Optional[IntegrationKey]:
         """
         Update integration key by ID
         """
-        key = self.get_by_id(key_id)
-        if not key:
-            return None
-            
-        for field, value in update_data.items():
-            if hasattr(key, field):
-                setattr(key, field, value)
+        values = {key: value for key, value in update_data.items() if key in IntegrationKey.__table__.c}
+        if values:
+            result = self.db.execute(
+                update(IntegrationKey)
+                .where(IntegrationKey.id == key_id)
+                .values(**values)
+                .execution_options(synchronize_session="evaluate")
+            )
+            self.db.commit()
+            if not result.rowcount:
+                return None
                 
-        self.db.commit()
-        self.db.refresh(key)
-        
-        return key
+        return self.get_by_id(key_id)
         
     def delete(self, key_id: int) -> bool:
         """
         Delete integration key by ID
         """
-        key = self.get_by_id(key_id)
-        if not key:
-            return False
-            
-        self.db.delete(key)
+        result = self.db.execute(
+            delete(IntegrationKey)
+            .where(IntegrationKey.id == key_id)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
         
-        return True
+        return result.rowcount > 0
         
     def delete_by_tenant_and_type(self, tenant_id: str, integration_type: IntegrationType) -> bool:
         """
         Delete integration key by tenant ID and integration type
         """
-        key = self.get_by_tenant_and_type(tenant_id, integration_type)
-        if not key:
-            return False
-            
-        self.db.delete(key)
+        result = self.db.execute(
+            delete(IntegrationKey)
+            .where(
+                IntegrationKey.tenant_id == tenant_id,
+                IntegrationKey.integration_type == integration_type
+            )
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
         
-        return True
+        return result.rowcount > 0
@@ -1,14 +1,28 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+import uuid
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import Row, delete, exists, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.models import Tenant, generate_uuid
+from app.db.models import Tenant, User, generate_uuid
 from app.schemas.tenant import TenantCreate
 
 
+# Columns serialized by TenantResponse
+RESPONSE_COLUMNS = (
+    Tenant.id,
+    Tenant.business_name,
+    Tenant.business_type,
+    Tenant.email,
+    Tenant.estimated_invoices_monthly,
+    Tenant.created_at,
+    Tenant.updated_at,
+)
+
 class TenantRepository:
     """
     Repository for Tenant CRUD operations
     """
+    __slots__ = ("db",)
     
     def __init__(self, db: Session):
         self.db = db
@@ -30,50 +44,108 @@ class TenantRepository:
         
         return db_tenant
         
+    def bulk_create(self, tenants_data: List[TenantCreate]) -> List[str]:
+        """
+        Create many tenants with a single multi-row INSERT
+        IDs are generated here, so they are returned without reading the rows back
+        """
+        rows = [
+            {
+                "id": generate_uuid(),
+                "business_name": tenant_data.business_name,
+                "business_type": tenant_data.business_type,
+                "email": tenant_data.email,
+                "estimated_invoices_monthly": tenant_data.estimated_invoices_monthly,
+            }
+            for tenant_data in tenants_data
+        ]
+        if rows:
+            self.db.execute(insert(Tenant), rows)
+            self.db.commit()
+            
+        return [row["id"] for row in rows]
+        
     def get_by_id(self, tenant_id: str) -> Optional[Tenant]:
         """
-        Get tenant by ID
+        Get tenant by ID; an ID that is not a valid UUID matches no tenant
         """
-        return self.db.query(Tenant).filter(Tenant.id == tenant_id).first()
+        try:
+            uuid.UUID(str(tenant_id))
+        except ValueError:
+            return None
+        return self.db.get(Tenant, tenant_id)
         
     def get_by_email(self, email: str) -> Optional[Tenant]:
         """
         Get tenant by email
         """
-        return self.db.query(Tenant).filter(Tenant.email == email).first()
+        return self.db.execute(select(Tenant).where(Tenant.email == email)).scalar_one_or_none()
+        
+    def signup_conflicts(self, email: str, cognito_id: str) -> Tuple[bool, bool]:
+        """
+        Check in one query whether a tenant already uses the email and a user the Cognito ID
+        Returns (tenant_email_exists, cognito_user_exists)
+        """
+        tenant_exists, user_exists = self.db.execute(
+            select(
+                exists().where(Tenant.email == email),
+                exists().where(User.cognito_id == cognito_id),
+            )
+        ).one()
+        return bool(tenant_exists), bool(user_exists)
         
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Tenant]:
         """
         Get all tenants
         """
-        return self.db.query(Tenant).offset(skip).limit(limit).all()
+        return self.db.execute(select(Tenant).offset(skip).limit(limit)).scalars().all()
+        
+    def get_all_with_users(self, skip: int = 0, limit: int = 100) -> List[Tenant]:
+        """
+        Get all tenants with their users loaded
+        Users for the whole page come back in one extra IN query instead of one per tenant
+        """
+        return self.db.execute(
+            select(Tenant)
+            .options(selectinload(Tenant.users))
+            .offset(skip)
+            .limit(limit)
+        ).scalars().all()
+        
+    def get_rows(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        """
+        Get tenants as plain rows of the TenantResponse columns
+        Skips ORM hydration for read-only listings
+        """
+        return self.db.execute(select(*RESPONSE_COLUMNS).offset(skip).limit(limit)).all()
         
     def update(self, tenant_id: str, update_data: Dict[str, Any]) -> Optional[Tenant]:
         """
         Update tenant by ID
         """
-        tenant = self.get_by_id(tenant_id)
-        if not tenant:
-            return None
-            
-        for key, value in update_data.items():
-            if hasattr(tenant, key):
-                setattr(tenant, key, value)
+        values = {key: value for key, value in update_data.items() if key in Tenant.__table__.c}
+        if values:
+            result = self.db.execute(
+                update(Tenant)
+                .where(Tenant.id == tenant_id)
+                .values(**values)
+                .execution_options(synchronize_session="evaluate")
+            )
+            self.db.commit()
+            if not result.rowcount:
+                return None
                 
-        self.db.commit()
-        self.db.refresh(tenant)
-        
-        return tenant
+        return self.get_by_id(tenant_id)
         
     def delete(self, tenant_id: str) -> bool:
         """
         Delete tenant by ID
         """
-        tenant = self.get_by_id(tenant_id)
-        if not tenant:
-            return False
-            
-        self.db.delete(tenant)
+        result = self.db.execute(
+            delete(Tenant)
+            .where(Tenant.id == tenant_id)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
         
-        return True
+        return result.rowcount > 0
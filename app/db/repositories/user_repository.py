@@ -1,14 +1,62 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+import threading
+from collections import defaultdict
+from typing import Iterable, List, Optional, Dict, Any
+from cachetools import TTLCache
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached, raiseload
 
 from app.db.models import User
 from app.schemas.user import UserCreate, UserCreateWithCognito, UserUpdate, UserStatusUpdate
 
 
+# Columns needed by the authentication path; timestamps are left deferred
+AUTH_COLUMNS = (
+    User.id,
+    User.tenant_id,
+    User.cognito_id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.role,
+    User.status,
+)
+AUTH_KEYS = tuple(column.key for column in AUTH_COLUMNS)
+
+# Columns serialized by UserResponse
+RESPONSE_COLUMNS = (
+    User.id,
+    User.cognito_id,
+    User.tenant_id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.role,
+    User.status,
+    User.created_at,
+    User.updated_at,
+)
+
+# Users resolved by Cognito ID, kept as detached instances and merged into the
+# caller's session on a hit. Every authenticated request resolves its token
+# subject here, so most skip the users table; writes below drop the entry.
+USER_CACHE_TTL = 60  # 1 minute
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+
+
+def invalidate_cached_user(cognito_id: str) -> None:
+    """
+    Drop a user from the Cognito ID cache
+    """
+    with _user_cache_lock:
+        _user_cache.pop(cognito_id, None)
+
+
 class UserRepository:
     """
     Repository for User CRUD operations
     """
+    __slots__ = ("db",)
     
     def __init__(self, db: Session):
         self.db = db
@@ -33,94 +81,181 @@ class UserRepository:
         
         return db_user
         
+    def bulk_create(self, users_data: List[UserCreateWithCognito]) -> int:
+        """
+        Create many users with a single multi-row INSERT
+        Returns the number of users created
+        """
+        rows = [
+            {
+                "cognito_id": user_data.cognito_id,
+                "email": user_data.email,
+                "first_name": user_data.first_name,
+                "last_name": user_data.last_name,
+                "tenant_id": user_data.tenant_id,
+                "role": user_data.role,
+                "status": user_data.status,
+            }
+            for user_data in users_data
+        ]
+        if rows:
+            self.db.execute(insert(User), rows)
+            self.db.commit()
+            
+        return len(rows)
+        
     def get_by_id(self, user_id: int) -> Optional[User]:
         """
         Get user by ID
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        return self.db.get(User, user_id)
         
     def get_by_cognito_id(self, cognito_id: str) -> Optional[User]:
         """
         Get user by Cognito ID
         """
-        return self.db.query(User).filter(User.cognito_id == cognito_id).first()
+        with _user_cache_lock:
+            cached = _user_cache.get(cognito_id)
+        if cached is not None:
+            return self.db.merge(cached, load=False)
+            
+        user = self.db.execute(
+            select(User)
+            .options(load_only(*AUTH_COLUMNS))
+            .where(User.cognito_id == cognito_id)
+        ).scalar_one_or_none()
+        
+        if user is not None:
+            # Cache a detached copy so the instance returned stays bound to this session
+            snapshot = User(**{key: getattr(user, key) for key in AUTH_KEYS})
+            make_transient_to_detached(snapshot)
+            with _user_cache_lock:
+                _user_cache[cognito_id] = snapshot
+                
+        return user
         
     def get_by_email(self, email: str) -> Optional[User]:
         """
         Get user by email
         """
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.execute(select(User).where(User.email == email).limit(1)).scalars().first()
     
-    def get_by_tenant(self, tenant_id: str, skip: int = 0, limit: int = 100) -> List[User]:
+    def get_by_tenant(self, tenant_id: str, after_id: Optional[int] = None, limit: int = 100) -> List[User]:
         """
-        Get all users for a specific tenant
+        Get a page of users for a specific tenant, ordered by ID
+        Pass the last ID of the previous page as after_id to fetch the next one
+        The tenant relationship is never needed by callers, so lazy loading it is
+        disallowed rather than silently issuing one query per user
         """
-        return self.db.query(User).filter(User.tenant_id == tenant_id).offset(skip).limit(limit).all()
+        stmt = (
+            select(User)
+            .options(raiseload(User.tenant))
+            .where(User.tenant_id == tenant_id)
+        )
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        return self.db.execute(stmt.order_by(User.id).limit(limit)).scalars().all()
+        
+    def get_by_tenants(self, tenant_ids: Iterable[str]) -> Dict[str, List[User]]:
+        """
+        Get the users of several tenants in one query, grouped by tenant ID
+        Use instead of calling get_by_tenant once per tenant
+        """
+        tenant_ids = list(tenant_ids)
+        if not tenant_ids:
+            return {}
+            
+        users_by_tenant: Dict[str, List[User]] = defaultdict(list)
+        users = self.db.execute(
+            select(User)
+            .options(raiseload(User.tenant))
+            .where(User.tenant_id.in_(tenant_ids))
+            .order_by(User.id)
+        ).scalars()
+        for user in users:
+            users_by_tenant[user.tenant_id].append(user)
+        return users_by_tenant
+        
+    def get_rows_by_tenant(self, tenant_id: str, after_id: Optional[int] = None, limit: int = 100) -> List[Row]:
+        """
+        Get a page of a tenant's users as plain rows of the UserResponse columns
+        Skips ORM hydration for read-only listings
+        """
+        stmt = select(*RESPONSE_COLUMNS).where(User.tenant_id == tenant_id)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        return self.db.execute(stmt.order_by(User.id).limit(limit)).all()
         
     def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
         """
         Get all users
         """
-        return self.db.query(User).offset(skip).limit(limit).all()
+        return self.db.execute(select(User).offset(skip).limit(limit)).scalars().all()
         
     def update(self, user_id: int, update_data: UserUpdate) -> Optional[User]:
         """
         Update user by ID
         """
-        user = self.get_by_id(user_id)
-        if not user:
+        values = update_data.dict(exclude_unset=True)
+        if values and not self._update_where(User.id == user_id, values):
             return None
             
-        update_dict = update_data.dict(exclude_unset=True)
-        for key, value in update_dict.items():
-            setattr(user, key, value)
-                
-        self.db.commit()
-        self.db.refresh(user)
-        
+        user = self.get_by_id(user_id)
+        if user is not None:
+            invalidate_cached_user(user.cognito_id)
         return user
         
     def update_by_cognito_id(self, cognito_id: str, update_data: UserUpdate) -> Optional[User]:
         """
         Update user by Cognito ID
         """
-        user = self.get_by_cognito_id(cognito_id)
-        if not user:
+        values = update_data.dict(exclude_unset=True)
+        if values and not self._update_where(User.cognito_id == cognito_id, values):
             return None
             
-        update_dict = update_data.dict(exclude_unset=True)
-        for key, value in update_dict.items():
-            setattr(user, key, value)
-                
-        self.db.commit()
-        self.db.refresh(user)
-        
-        return user
+        invalidate_cached_user(cognito_id)
+        return self.get_by_cognito_id(cognito_id)
         
     def update_status_by_cognito_id(self, cognito_id: str, status_update: UserStatusUpdate) -> Optional[User]:
         """
         Update user status by Cognito ID
         This focused method only updates the status field for security reasons
         """
-        user = self.get_by_cognito_id(cognito_id)
-        if not user:
+        if not self._update_where(User.cognito_id == cognito_id, {"status": status_update.status}):
             return None
             
-        user.status = status_update.status
-        self.db.commit()
-        self.db.refresh(user)
+        invalidate_cached_user(cognito_id)
+        return self.get_by_cognito_id(cognito_id)
         
-        return user
+    def _update_where(self, condition, values: Dict[str, Any]) -> bool:
+        """
+        Apply values in a single UPDATE and commit; returns whether a row matched
+        Loaded instances in the session are synchronized in Python instead of re-selected
+        """
+        result = self.db.execute(
+            update(User)
+            .where(condition)
+            .values(**values)
+            .execution_options(synchronize_session="evaluate")
+        )
+        self.db.commit()
+        return result.rowcount > 0
         
     def delete(self, user_id: int) -> bool:
         """
         Delete user by ID
         """
-        user = self.get_by_id(user_id)
-        if not user:
+        # Only the Cognito ID is read back, to drop the user from the cache
+        cognito_id = self.db.execute(select(User.cognito_id).where(User.id == user_id)).scalar()
+        if cognito_id is None:
             return False
             
-        self.db.delete(user)
+        self.db.execute(
+            delete(User)
+            .where(User.id == user_id)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
+        invalidate_cached_user(cognito_id)
         
         return True
@@ -1,14 +1,54 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
 
 # Create SQLAlchemy base and engine
+# pool_pre_ping costs one lightweight ping per checkout, far cheaper than failing a
+# request on a connection MySQL has already dropped; LIFO checkout keeps a small set
+# of connections warm and lets idle overflow connections age out via pool_recycle
 settings = get_settings()
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    # Compiled-SQL cache shared by all repository statements
+    query_cache_size=1200,
+    isolation_level=settings.DB_ISOLATION_LEVEL,
+    connect_args={"charset": "utf8mb4"},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions for read-only endpoints: AUTOCOMMIT skips the BEGIN/COMMIT round trips
+# (InnoDB runs each autocommit SELECT as a read-only transaction), and nothing is
+# written so there is no reason to expire loaded instances
+ReadOnlySessionLocal = sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+)
+
+logger = logging.getLogger("app.db")
+
+if settings.APP_ENV == "development":
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    @event.listens_for(ReadOnlySessionLocal, "do_orm_execute")
+    def warn_on_lazy_load(orm_execute_state):
+        """
+        Log every relationship lazy load with the stack that triggered it
+        Inside a loop these become N+1 queries; load them with selectinload/joinedload instead
+        """
+        state = orm_execute_state.lazy_loaded_from
+        if state is not None:
+            logger.warning(f"Lazy load issued from {state.class_.__name__} instance", stack_info=True)
+
 # Create declarative base that all models will inherit from
 Base = declarative_base()
 
@@ -21,3 +61,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_db_ro():
+    """
+    Get read-only database session
+    Only for endpoints that never write and do not also depend on get_db,
+    otherwise the request would hold two pooled connections
+    """
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
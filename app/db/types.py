@@ -0,0 +1,55 @@
+import uuid
+
+from sqlalchemy.dialects.mysql import BINARY
+from sqlalchemy.types import SmallInteger, TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """
+    UUID stored as BINARY(16) and exposed to Python as its canonical string form
+    Binds accept either a uuid.UUID or its string form
+    """
+    impl = BINARY(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        return uuid.UUID(value).bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return str(uuid.UUID(bytes=value))
+
+
+class SmallEnum(TypeDecorator):
+    """
+    Python Enum stored as a SMALLINT code given by the member's position in the Enum
+    New members must be appended so existing codes keep their meaning
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._members = tuple(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # str-valued members hash and compare like their values, so one dict lookup
+        # covers both; anything else goes through the Enum for its ValueError
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[self.enum_class(value)]
+        return code
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
@@ -1,8 +1,37 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 
+@dataclass(slots=True)
+class TokenBundle:
+    """
+    Tokens returned by an accounting system's OAuth token endpoint
+    """
+    access_token: str
+    # Refresh responses usually omit it; the stored refresh token stays valid
+    refresh_token: Optional[str] = None
+    expires_in: int = 3600
+    api_domain: Optional[str] = None
+    # Any other fields the provider returned (token_type, scope, ...)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_response(cls, response_data: Dict[str, Any]) -> "TokenBundle":
+        """
+        Parse a token endpoint JSON response
+        """
+        extra = dict(response_data)
+        return cls(
+            access_token=extra.pop("access_token"),
+            refresh_token=extra.pop("refresh_token", None),
+            expires_in=int(extra.pop("expires_in", 3600)),
+            api_domain=extra.pop("api_domain", None),
+            extra=extra,
+        )
+
+
 class AccountingIntegrationBase(ABC):
     """
     Base abstract class for all accounting system integrations.
@@ -10,23 +39,23 @@ class AccountingIntegrationBase(ABC):
     """
     
     @abstractmethod
-    async def exchange_auth_code(self, auth_code: str) -> Dict[str, Any]:
+    async def exchange_auth_code(self, auth_code: str) -> TokenBundle:
         """
         Exchange authorization code for access token and refresh token
         """
         pass
     
     @abstractmethod
-    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+    async def refresh_access_token(self, refresh_token: str) -> TokenBundle:
         """
         Use refresh token to get a new access token when current one expires
         """
         pass
     
     @abstractmethod
-    async def get_token_expiry(self, token_data: Dict[str, Any]) -> datetime:
+    def get_token_expiry(self, tokens: TokenBundle) -> datetime:
         """
-        Calculate token expiry datetime from token data
+        Calculate token expiry datetime from the token bundle
         """
         pass
     
@@ -1,16 +1,43 @@
 import httpx
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any
 
 from app.core.config import get_settings
-from app.integrations.base import AccountingIntegrationBase
+from app.integrations.base import AccountingIntegrationBase, TokenBundle
 from app.db.models import IntegrationType
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Zoho almost always issues one-hour tokens, so reuse that timedelta
+_COMMON_EXPIRIES = {3600: timedelta(hours=1)}
+
+# Shared HTTP client so token exchanges and refreshes reuse pooled TLS connections to Zoho
+_http = httpx.AsyncClient(
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+)
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared HTTP client used for Zoho token requests
+    """
+    await _http.aclose()
+
+
+def _mask_tokens(response_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a token response with the tokens masked for logging
+    """
+    safe_response = dict(response_data)
+    for key in ("access_token", "refresh_token"):
+        if key in safe_response:
+            safe_response[key] = "***MASKED***"
+    return safe_response
+
 
 class ZohoIntegration(AccountingIntegrationBase):
     """
@@ -26,7 +53,7 @@ class ZohoIntegration(AccountingIntegrationBase):
         """Return the integration type"""
         return IntegrationType.ZOHO
     
-    async def exchange_auth_code(self, auth_code: str) -> Dict[str, Any]:
+    async def exchange_auth_code(self, auth_code: str) -> TokenBundle:
         """
         Exchange authorization code for access and refresh tokens
         """
@@ -38,40 +65,36 @@ class ZohoIntegration(AccountingIntegrationBase):
             "code": auth_code
         }
         
-        # Log the request data (mask sensitive information)
-        safe_log_data = request_data.copy()
-        safe_log_data["client_secret"] = "***MASKED***" 
-        safe_log_data["code"] = "***MASKED***"
-        logger.info(json.dumps({"ZOHO API REQUEST [exchange_auth_code]": safe_log_data}, indent=2))
+        # Log the request data (mask sensitive information); skip building it when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            safe_log_data = request_data.copy()
+            safe_log_data["client_secret"] = "***MASKED***" 
+            safe_log_data["code"] = "***MASKED***"
+            logger.info(json.dumps({"ZOHO API REQUEST [exchange_auth_code]": safe_log_data}))
+        
+        response = await _http.post(
+            self.token_url,
+            data=request_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        # Log the response
+        response_data = response.json() if response.content else {}
+        status_code = response.status_code
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"ZOHO API RESPONSE [exchange_auth_code]": {"status_code": status_code, "response": _mask_tokens(response_data)}}))
+        
+        # Zoho reports some failures (e.g. invalid_code) as a 200 without tokens
+        if status_code != 200 or "access_token" not in response_data:
+            safe_response = _mask_tokens(response_data)
+            error_message = f"Failed to retrieve access token: {status_code}"
+            logger.error(json.dumps({"error": error_message, "response": safe_response}))
+            raise ValueError(f"{error_message}, {safe_response}")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.token_url,
-                data=request_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            # Log the response
-            response_data = response.json() if response.content else {}
-            status_code = response.status_code
-            
-            # Create a safe copy for logging, masking sensitive info
-            safe_response = response_data.copy() if response_data else {}
-            if "access_token" in safe_response:
-                safe_response["access_token"] = "***MASKED***"
-            if "refresh_token" in safe_response:
-                safe_response["refresh_token"] = "***MASKED***"
-                
-            logger.info(json.dumps({"ZOHO API RESPONSE [exchange_auth_code]": {"status_code": status_code, "response": safe_response}}, indent=2))
-            
-            if status_code != 200:
-                error_message = f"Failed to retrieve access token: {status_code}"
-                logger.error(json.dumps({"error": error_message, "response": safe_response}, indent=2))
-                raise ValueError(f"{error_message}, {safe_response}")
-            
-            return response_data
+        return TokenBundle.from_response(response_data)
     
-    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+    async def refresh_access_token(self, refresh_token: str) -> TokenBundle:
         """
         Use refresh token to get a new access token when current one expires
         """
@@ -82,43 +105,40 @@ class ZohoIntegration(AccountingIntegrationBase):
             "refresh_token": refresh_token
         }
         
-        # Log the request data (mask sensitive information)
-        safe_log_data = request_data.copy()
-        safe_log_data["client_secret"] = "***MASKED***" 
-        safe_log_data["refresh_token"] = "***MASKED***"
-        logger.info(json.dumps({"ZOHO API REQUEST [refresh_access_token]": safe_log_data}, indent=2))
+        # Log the request data (mask sensitive information); skip building it when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            safe_log_data = request_data.copy()
+            safe_log_data["client_secret"] = "***MASKED***" 
+            safe_log_data["refresh_token"] = "***MASKED***"
+            logger.info(json.dumps({"ZOHO API REQUEST [refresh_access_token]": safe_log_data}))
+        
+        response = await _http.post(
+            self.token_url,
+            data=request_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        # Log the response
+        response_data = response.json() if response.content else {}
+        status_code = response.status_code
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"ZOHO API RESPONSE [refresh_access_token]": {"status_code": status_code, "response": _mask_tokens(response_data)}}))
+        
+        # Zoho reports some failures (e.g. invalid_code) as a 200 without tokens
+        if status_code != 200 or "access_token" not in response_data:
+            safe_response = _mask_tokens(response_data)
+            error_message = f"Failed to refresh access token: {status_code}"
+            logger.error(json.dumps({"error": error_message, "response": safe_response}))
+            raise ValueError(f"{error_message}, {safe_response}")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.token_url,
-                data=request_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            # Log the response
-            response_data = response.json() if response.content else {}
-            status_code = response.status_code
-            
-            # Create a safe copy for logging, masking sensitive info
-            safe_response = response_data.copy() if response_data else {}
-            if "access_token" in safe_response:
-                safe_response["access_token"] = "***MASKED***"
-            if "refresh_token" in safe_response:
-                safe_response["refresh_token"] = "***MASKED***"
-                
-            logger.info(json.dumps({"ZOHO API RESPONSE [refresh_access_token]": {"status_code": status_code, "response": safe_response}}, indent=2))
-            
-            if status_code != 200:
-                error_message = f"Failed to refresh access token: {status_code}"
-                logger.error(json.dumps({"error": error_message, "response": safe_response}, indent=2))
-                raise ValueError(f"{error_message}, {safe_response}")
-            
-            return response_data
+        return TokenBundle.from_response(response_data)
     
-    async def get_token_expiry(self, token_data: Dict[str, Any]) -> datetime:
+    def get_token_expiry(self, tokens: TokenBundle) -> datetime:
         """
-        Calculate token expiry datetime from token data
+        Calculate token expiry datetime (UTC) from the token bundle
         """
         # Zoho API returns expires_in in seconds
-        expires_in = int(token_data.get("expires_in", 3600))
-        return datetime.utcnow() + timedelta(seconds=expires_in)
+        expires_in = tokens.expires_in
+        lifetime = _COMMON_EXPIRIES.get(expires_in) or timedelta(seconds=expires_in)
+        return datetime.now(timezone.utc) + lifetime
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -47,6 +47,11 @@ class UserResponse(UserBase):
         from_attributes = True
         
 
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_after_id: Optional[int] = None
+
+
 class UserUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
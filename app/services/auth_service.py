@@ -1,60 +1,112 @@
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
+from functools import cached_property, lru_cache
 from sqlalchemy.orm import Session
-from cryptography.fernet import Fernet
-from base64 import urlsafe_b64encode
-import hashlib
+import time
 import logging
-import json
+import orjson
+from cryptography.fernet import Fernet, InvalidToken
 
 from app.core.config import get_settings
-from app.db.models import IntegrationType, User, UserRole, UserStatus, Tenant
+from app.db.models import IntegrationKey, IntegrationType, User, UserRole, UserStatus, Tenant
 from app.db.repositories.tenant_repository import TenantRepository
 from app.db.repositories.user_repository import UserRepository
 from app.db.repositories.integration_repository import IntegrationKeyRepository
+from app.integrations.base import TokenBundle
 from app.schemas.tenant import TenantCreate
 from app.schemas.user import UserCreate, UserCreateWithCognito, UserUpdate, UserStatusUpdate
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# User fields the service sets itself; excluded from request data to avoid duplicate keyword errors
+USER_ASSIGNED_FIELDS = {"cognito_id", "role", "status", "tenant_id"}
+
+# The Rust-backed rfernet is used for integration tokens when installed (fast-crypto extra)
+try:
+    import rfernet
+except ImportError:
+    rfernet = None
+
+
+class _RFernet:
+    """
+    rfernet cipher behind cryptography's Fernet API (bytes in, bytes out, InvalidToken)
+    rfernet returns tokens as str and only decrypts str tokens
+    """
+    __slots__ = ("_fernet",)
+    
+    def __init__(self, key: str):
+        self._fernet = rfernet.Fernet(key)
+        
+    def encrypt(self, data: bytes) -> bytes:
+        return self._fernet.encrypt(data).encode()
+        
+    def decrypt(self, token: bytes) -> bytes:
+        try:
+            return self._fernet.decrypt(token.decode())
+        except (rfernet.DecryptionError, UnicodeDecodeError) as e:
+            raise InvalidToken from e
+
+
+@lru_cache(maxsize=1)
+def _cipher_for(fernet_key: str) -> Union[Fernet, _RFernet]:
+    """
+    Build the Fernet cipher for token encryption/decryption once per process
+    """
+    if rfernet is not None:
+        return _RFernet(fernet_key)
+    return Fernet(fernet_key)
+
+
 class AuthService:
     """Service for authentication and token management operations"""
     
     def __init__(self, db: Session):
         self.db = db
         self.settings = get_settings()
-        self.encryption_key = self.settings.ENCRYPTION_KEY.encode()
-        self.user_repo = UserRepository(db)
-        self.tenant_repo = TenantRepository(db)
-        self.integration_repo = IntegrationKeyRepository(db)
         
-    def _create_cipher(self) -> Fernet:
-        """Create Fernet cipher for token encryption/decryption"""
-        if not self.encryption_key:
-            raise ValueError("Encryption key not configured")
+    # Repositories are built on first use; most requests only touch one of them
+    @cached_property
+    def user_repo(self) -> UserRepository:
+        return UserRepository(self.db)
         
-        # Ensure the key is 32 bytes for Fernet
-        # If key is not 32 bytes, we hash it to get a consistent size
-        if len(self.encryption_key) != 32:
-            digest = hashlib.sha256(self.encryption_key).digest()
-            key = urlsafe_b64encode(digest)
-        else:
-            key = urlsafe_b64encode(self.encryption_key)
-            
-        return Fernet(key)
+    @cached_property
+    def tenant_repo(self) -> TenantRepository:
+        return TenantRepository(self.db)
+        
+    @cached_property
+    def integration_repo(self) -> IntegrationKeyRepository:
+        return IntegrationKeyRepository(self.db)
         
-    def _encrypt_token(self, token: str) -> str:
+    def _encrypt_token(self, token: str) -> bytes:
         """Encrypt a token"""
-        cipher = self._create_cipher()
-        return cipher.encrypt(token.encode()).decode()
+        return _cipher_for(self.settings.fernet_key).encrypt(token.encode())
         
-    def _decrypt_token(self, encrypted_token: str) -> str:
+    def _decrypt_token(self, encrypted_token: bytes) -> str:
         """Decrypt a token"""
-        cipher = self._create_cipher()
-        return cipher.decrypt(encrypted_token.encode()).decode()
+        return _cipher_for(self.settings.fernet_key).decrypt(encrypted_token).decode()
+        
+    def _encrypt_token_pair(self, access_token: str, refresh_token: str) -> bytes:
+        """Encrypt both tokens as one Fernet token (4-byte access token length, access, refresh)"""
+        access = access_token.encode()
+        blob = len(access).to_bytes(4, "big") + access + refresh_token.encode()
+        return _cipher_for(self.settings.fernet_key).encrypt(blob)
+        
+    def _decrypt_token_pair(self, integration_key: IntegrationKey) -> Tuple[str, str]:
+        """Decrypt the stored access and refresh tokens"""
+        # Keys stored before tokens were paired hold them in separate columns
+        if integration_key.refresh_token is not None:
+            return (
+                self._decrypt_token(integration_key.access_token),
+                self._decrypt_token(integration_key.refresh_token),
+            )
+            
+        blob = _cipher_for(self.settings.fernet_key).decrypt(integration_key.access_token)
+        size = int.from_bytes(blob[:4], "big")
+        return blob[4:4 + size].decode(), blob[4 + size:].decode()
     
-    async def create_tenant_with_admin(self, 
+    def create_tenant_with_admin(self, 
                                      tenant_data: TenantCreate, 
                                      user_data: UserCreate,
                                      cognito_id: str) -> Dict[str, Any]:
@@ -62,14 +114,12 @@ class AuthService:
         Create a new tenant and admin user
         """
         try:
-            # Check if tenant with email already exists
-            existing_tenant = self.tenant_repo.get_by_email(tenant_data.email)
-            if existing_tenant:
+            # Check if tenant with email or user with Cognito ID already exists
+            tenant_exists, user_exists = self.tenant_repo.signup_conflicts(tenant_data.email, cognito_id)
+            if tenant_exists:
                 return {"error": "A tenant with this email already exists"}
                 
-            # Check if user with Cognito ID already exists
-            existing_user = self.user_repo.get_by_cognito_id(cognito_id)
-            if existing_user:
+            if user_exists:
                 return {"error": "User already exists"}
                 
             # Create tenant
@@ -77,14 +127,10 @@ class AuthService:
             
             # Create admin user for this tenant
             # Extract user_data dict and remove fields that will be explicitly set
-            user_data_dict = user_data.dict()
-            # Remove fields that might cause duplication errors
-            fields_to_remove = ['cognito_id', 'role', 'status', 'tenant_id']
-            for field in fields_to_remove:
-                if field in user_data_dict:
-                    user_data_dict.pop(field)
+            user_data_dict = user_data.dict(exclude=USER_ASSIGNED_FIELDS)
                 
-            user_with_cognito = UserCreateWithCognito(
+            # user_data is already validated and the remaining values come from trusted sources
+            user_with_cognito = UserCreateWithCognito.model_construct(
                 **user_data_dict,
                 cognito_id=cognito_id,
                 tenant_id=tenant.id,
@@ -112,7 +158,7 @@ class AuthService:
             logger.error(f"Error creating tenant with admin: {str(e)}")
             return {"error": f"Failed to create tenant: {str(e)}"}
     
-    async def add_user_to_tenant(self, 
+    def add_user_to_tenant(self, 
                                tenant_id: int, 
                                user_data: UserCreate,
                                cognito_id: str) -> Dict[str, Any]:
@@ -132,14 +178,10 @@ class AuthService:
                 
             # Create user entry in database
             # Extract user_data dict and remove fields that will be explicitly set
-            user_data_dict = user_data.dict()
-            # Remove fields that might cause duplication errors
-            fields_to_remove = ['cognito_id', 'role', 'status', 'tenant_id']
-            for field in fields_to_remove:
-                if field in user_data_dict:
-                    user_data_dict.pop(field)
+            user_data_dict = user_data.dict(exclude=USER_ASSIGNED_FIELDS)
                 
-            user_with_cognito = UserCreateWithCognito(
+            # user_data is already validated and the remaining values come from trusted sources
+            user_with_cognito = UserCreateWithCognito.model_construct(
                 **user_data_dict,
                 cognito_id=cognito_id,
                 tenant_id=tenant_id
@@ -160,10 +202,10 @@ class AuthService:
             logger.error(f"Error adding user to tenant: {str(e)}")
             return {"error": f"Failed to add user: {str(e)}"}
     
-    async def store_integration_tokens(self,
+    def store_integration_tokens(self,
                                      tenant_id: int,
                                      integration_type: IntegrationType,
-                                     token_data: Dict[str, Any],
+                                     tokens: TokenBundle,
                                      expires_at: datetime,
                                      org_id: Optional[str] = None,
                                      tenant_id_external: Optional[str] = None) -> Dict[str, Any]:
@@ -171,31 +213,25 @@ class AuthService:
         Store encrypted integration tokens for a tenant
         """
         try:
-            # Extract tokens
-            access_token = token_data.get("access_token")
-            refresh_token = token_data.get("refresh_token")
-            
-            if not access_token or not refresh_token:
+            if not tokens.access_token or not tokens.refresh_token:
                 return {"error": "Missing required tokens"}
                 
-            # Encrypt tokens
-            encrypted_access = self._encrypt_token(access_token)
-            encrypted_refresh = self._encrypt_token(refresh_token)
+            # Encrypt both tokens in one pass; the refresh_token column is left empty
+            encrypted_tokens = self._encrypt_token_pair(tokens.access_token, tokens.refresh_token)
             
-            # Extract and store any additional data
-            additional_data = {}
-            for key, value in token_data.items():
-                if key not in ["access_token", "refresh_token"]:
-                    additional_data[key] = value
+            # Store everything else the provider returned alongside the tokens
+            additional_data = dict(tokens.extra, expires_in=tokens.expires_in)
+            if tokens.api_domain is not None:
+                additional_data["api_domain"] = tokens.api_domain
                     
-            additional_json = json.dumps(additional_data) if additional_data else None
+            additional_json = orjson.dumps(additional_data).decode() if additional_data else None
                     
             # Store or update integration key
-            integration_key = self.integration_repo.create_or_update(
+            self.integration_repo.create(
                 tenant_id=tenant_id,
                 integration_type=integration_type,
-                access_token=encrypted_access,
-                refresh_token=encrypted_refresh,
+                access_token=encrypted_tokens,
+                refresh_token=None,
                 expires_at=expires_at,
                 org_id=org_id,
                 tenant_id_external=tenant_id_external,
@@ -205,15 +241,27 @@ class AuthService:
             return {
                 "success": True,
                 "tenant_id": tenant_id,
-                "integration_type": integration_key.integration_type,
-                "expires_at": integration_key.expires_at
+                "integration_type": integration_type,
+                "expires_at": expires_at
             }
             
         except Exception as e:
             logger.error(f"Error storing integration tokens: {str(e)}")
             return {"error": f"Failed to store integration tokens: {str(e)}"}
     
-    async def get_integration_tokens(self,
+    def check_integration_validity(self,
+                                      tenant_id: str,
+                                      integration_type: IntegrationType) -> Optional[Tuple[datetime, bool]]:
+        """
+        Return (expires_at, is_valid) for a tenant's integration without decrypting its tokens
+        Returns None if the tenant has no key for the integration
+        """
+        expiry = self.integration_repo.get_expiry(tenant_id, integration_type)
+        if expiry is None:
+            return None
+        return expiry.expires_at, time.time() < expiry.expires_at_ts
+    
+    def get_integration_tokens(self,
                                   tenant_id: int,
                                   integration_type: IntegrationType) -> Union[Dict[str, Any], None]:
         """
@@ -229,18 +277,14 @@ class AuthService:
                 return None
                 
             # Check if token is expired
-            now = datetime.utcnow()
-            if now >= integration_key.expires_at:
+            access_token, refresh_token = self._decrypt_token_pair(integration_key)
+            if time.time() >= integration_key.expires_at_ts:
                 return {
                     "error": "Token expired",
-                    "refresh_token": self._decrypt_token(integration_key.refresh_token),
+                    "refresh_token": refresh_token,
                     "expires_at": integration_key.expires_at
                 }
             
-            # Decrypt tokens
-            access_token = self._decrypt_token(integration_key.access_token)
-            refresh_token = self._decrypt_token(integration_key.refresh_token)
-            
             result = {
                 "access_token": access_token,
                 "refresh_token": refresh_token,
@@ -251,7 +295,7 @@ class AuthService:
             
             # Add additional data if available
             if integration_key.additional_data:
-                additional = json.loads(integration_key.additional_data)
+                additional = orjson.loads(integration_key.additional_data)
                 result.update(additional)
                 
             return result
@@ -260,7 +304,7 @@ class AuthService:
             logger.error(f"Error retrieving integration tokens: {str(e)}")
             return {"error": f"Failed to retrieve integration tokens: {str(e)}"}
 
-    async def update_user(self, user_id: int, update_data: UserUpdate) -> Dict[str, Any]:
+    def update_user(self, user_id: int, update_data: UserUpdate) -> Dict[str, Any]:
         """
         Update user data
         """
@@ -284,7 +328,7 @@ class AuthService:
             logger.error(f"Error updating user: {str(e)}")
             return {"error": f"Failed to update user: {str(e)}"}
 
-    async def update_user_status_by_cognito_id(self, cognito_id: str, status_update: UserStatusUpdate) -> Dict[str, Any]:
+    def update_user_status_by_cognito_id(self, cognito_id: str, status_update: UserStatusUpdate) -> Dict[str, Any]:
         """
         Update user status by cognito_id
         This is primarily used for updating a user's status from pending_confirmation to active
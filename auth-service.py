@@ -1,7 +1,9 @@
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 import httpx
+import json
 import os
+from cachetools import TTLCache
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
 
@@ -20,46 +22,53 @@ encryptor = Fernet(ENCRYPTION_KEY)
 
 app = FastAPI()
 
+# Shared HTTP client so each token exchange reuses pooled connections to Zoho
+client = httpx.AsyncClient(timeout=10.0, limits=httpx.Limits(max_keepalive_connections=20))
+
+
+@app.on_event("shutdown")
+async def close_client():
+    await client.aclose()
+
 # Pydantic schema for request body
 class AuthCodeRequest(BaseModel):
     auth_code: str
     user_id: int  # Or other identifier to associate with the integration
 
-# Simulated DB table as dictionary (in-memory)
-integration_keys_db = {}
+# Simulated DB table (in-memory), capped and expiring so a long-running dev server doesn't grow without bound
+# Maps user_id -> one Fernet token holding the encrypted token response
+integration_keys_db = TTLCache(maxsize=10_000, ttl=3600)
 
 @app.post("/zoho/auth")
 async def zoho_auth_handler(payload: AuthCodeRequest):
     try:
         # Step 1: Exchange auth_code for access_token
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                ZOHO_TOKEN_URL,
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": ZOHO_CLIENT_ID,
-                    "client_secret": ZOHO_CLIENT_SECRET,
-                    "redirect_uri": ZOHO_REDIRECT_URI,
-                    "code": payload.auth_code
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
+        response = await client.post(
+            ZOHO_TOKEN_URL,
+            data={
+                "grant_type": "authorization_code",
+                "client_id": ZOHO_CLIENT_ID,
+                "client_secret": ZOHO_CLIENT_SECRET,
+                "redirect_uri": ZOHO_REDIRECT_URI,
+                "code": payload.auth_code
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
 
         if response.status_code != 200:
             raise HTTPException(status_code=response.status_code, detail="Failed to retrieve access token")
 
         token_data = response.json()
 
-        # Step 2: Encrypt tokens before saving
-        encrypted_access_token = encryptor.encrypt(token_data["access_token"].encode()).decode()
-        encrypted_refresh_token = encryptor.encrypt(token_data["refresh_token"].encode()).decode()
+        # Step 2: Encrypt the tokens together before saving
+        encrypted_tokens = encryptor.encrypt(json.dumps({
+            "access_token": token_data["access_token"],
+            "refresh_token": token_data["refresh_token"],
+            "expires_in": token_data["expires_in"]
+        }).encode())
 
         # Step 3: Save to integration_keys_db (simulate DB insert)
-        integration_keys_db[payload.user_id] = {
-            "access_token": encrypted_access_token,
-            "refresh_token": encrypted_refresh_token,
-            "expires_in": token_data["expires_in"]
-        }
+        integration_keys_db[payload.user_id] = encrypted_tokens
 
         return {"status": "success", "message": "Tokens stored successfully."}
 
@@ -1,27 +1,31 @@
 import uvicorn
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 
 from app.api.router import api_router
+from app.core.auth import close_http_client
 from app.core.config import get_settings
 from app.db.base import Base, engine
+from app.integrations.zoho import close_http_client as close_zoho_http_client
+
+settings = get_settings()
 
 # Configure logging
 logging.basicConfig(
-    level=get_settings().LOG_LEVEL,
+    level=settings.LOG_LEVEL,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger("invoice-agent")
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Initialize FastAPI app
 app = FastAPI(
     title="Invoice Agent Authentication Service",
     description="API service for handling authentication with accounting systems",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS
@@ -34,10 +38,9 @@ app.add_middleware(
 )
 
 # Include API router
-app.include_router(api_router, prefix=get_settings().API_V1_PREFIX)
+app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 # Log application startup information
-settings = get_settings()
 logger.info(f"Starting application in {settings.APP_ENV} environment")
 logger.info(f"API endpoints available at: {settings.API_V1_PREFIX}")
 
@@ -57,10 +60,34 @@ else:
         logger.info("Authentication is enabled")
 
 
+@app.on_event("startup")
+async def configure_thread_pool():
+    """Size the threadpool that runs sync endpoints and dependencies"""
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREAD_POOL_SIZE
+
+
+@app.on_event("startup")
+def create_tables():
+    """Create missing tables when AUTO_CREATE_TABLES is set; migrations own the schema otherwise"""
+    if settings.AUTO_CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    """Close shared outbound HTTP clients"""
+    await close_http_client()
+    await close_zoho_http_client()
+
+
+# Health responses never change, so the encoded response is built once
+_HEALTH_OK = ORJSONResponse({"status": "ok"})
+
+
 @app.get("/health", tags=["Health"])
-def health_check():
+async def health_check():
     """Health check endpoint"""
-    return {"status": "ok"}
+    return _HEALTH_OK
 
 
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+"""Add users (tenant_id, id) index for keyset pagination
+
+Revision ID: 5b8e2f1a9c3d
+Revises: c3192377533c
+Create Date: 2026-10-15 09:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2f1a9c3d'
+down_revision = 'c3192377533c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_tenant_id_id', 'users', ['tenant_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_tenant_id_id', table_name='users')
@@ -0,0 +1,24 @@
+"""Unique integration key per tenant and integration type
+
+Revision ID: 8d4a6c2e1f7b
+Revises: 5b8e2f1a9c3d
+Create Date: 2026-10-15 10:03:47.215904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4a6c2e1f7b'
+down_revision = '5b8e2f1a9c3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint('uq_intkey_tenant_type', 'integration_keys', ['tenant_id', 'integration_type'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_intkey_tenant_type', 'integration_keys', type_='unique')
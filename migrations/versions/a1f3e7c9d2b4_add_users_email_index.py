@@ -0,0 +1,24 @@
+"""Add users email index
+
+Revision ID: a1f3e7c9d2b4
+Revises: 8d4a6c2e1f7b
+Create Date: 2026-10-15 10:21:09.664120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3e7c9d2b4'
+down_revision = '8d4a6c2e1f7b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_email'), table_name='users')
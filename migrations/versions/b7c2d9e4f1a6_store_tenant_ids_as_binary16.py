@@ -0,0 +1,67 @@
+"""Store tenant ids as BINARY(16)
+
+Revision ID: b7c2d9e4f1a6
+Revises: a1f3e7c9d2b4
+Create Date: 2026-10-15 10:48:52.031577
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c2d9e4f1a6'
+down_revision = 'a1f3e7c9d2b4'
+branch_labels = None
+depends_on = None
+
+# Child tables holding a tenant_id foreign key
+CHILD_TABLES = ('users', 'integration_keys')
+
+# Canonical 8-4-4-4-12 text form of a 16 byte value
+BIN_TO_UUID = "LOWER(INSERT(INSERT(INSERT(INSERT(HEX({col}), 9, 0, '-'), 14, 0, '-'), 19, 0, '-'), 24, 0, '-'))"
+
+
+def _drop_tenant_fks() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in CHILD_TABLES:
+        for fk in inspector.get_foreign_keys(table):
+            if fk['referred_table'] == 'tenants':
+                op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+
+def _create_tenant_fks() -> None:
+    for table in CHILD_TABLES:
+        op.create_foreign_key(f'fk_{table}_tenant_id', table, 'tenants', ['tenant_id'], ['id'])
+
+
+def upgrade() -> None:
+    _drop_tenant_fks()
+
+    # Go through VARBINARY so the hex text can be rewritten in place before narrowing
+    op.alter_column('tenants', 'id', existing_type=mysql.VARCHAR(36), type_=mysql.VARBINARY(36), existing_nullable=False)
+    op.execute("UPDATE tenants SET id = UNHEX(REPLACE(id, '-', ''))")
+    op.alter_column('tenants', 'id', existing_type=mysql.VARBINARY(36), type_=mysql.BINARY(16), existing_nullable=False)
+
+    for table in CHILD_TABLES:
+        op.alter_column(table, 'tenant_id', existing_type=mysql.VARCHAR(36), type_=mysql.VARBINARY(36), existing_nullable=False)
+        op.execute(f"UPDATE {table} SET tenant_id = UNHEX(REPLACE(tenant_id, '-', ''))")
+        op.alter_column(table, 'tenant_id', existing_type=mysql.VARBINARY(36), type_=mysql.BINARY(16), existing_nullable=False)
+
+    _create_tenant_fks()
+
+
+def downgrade() -> None:
+    _drop_tenant_fks()
+
+    op.alter_column('tenants', 'id', existing_type=mysql.BINARY(16), type_=mysql.VARBINARY(36), existing_nullable=False)
+    op.execute(f"UPDATE tenants SET id = {BIN_TO_UUID.format(col='id')}")
+    op.alter_column('tenants', 'id', existing_type=mysql.VARBINARY(36), type_=mysql.VARCHAR(36), existing_nullable=False)
+
+    for table in CHILD_TABLES:
+        op.alter_column(table, 'tenant_id', existing_type=mysql.BINARY(16), type_=mysql.VARBINARY(36), existing_nullable=False)
+        op.execute(f"UPDATE {table} SET tenant_id = {BIN_TO_UUID.format(col='tenant_id')}")
+        op.alter_column(table, 'tenant_id', existing_type=mysql.VARBINARY(36), type_=mysql.VARCHAR(36), existing_nullable=False)
+
+    _create_tenant_fks()
@@ -4,9 +4,13 @@ Revision ID: c3192377533c
 Revises: 
 Create Date: 2025-06-05 23:29:44.312054
 
+Databases whose tables were created by the application's startup create_all
+already hold this schema; run `alembic stamp c3192377533c` on them before upgrading.
+
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
 
 
 # revision identifiers, used by Alembic.
@@ -18,11 +22,57 @@ depends_on = None
 
 def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.create_table('tenants',
+    sa.Column('id', mysql.VARCHAR(length=36), nullable=False),
+    sa.Column('business_name', sa.String(length=255), nullable=False),
+    sa.Column('business_type', sa.Enum('SOLE_PROPRIETOR', 'LLC', 'CORPORATION', 'PARTNERSHIP', 'OTHER', name='businesstype'), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('estimated_invoices_monthly', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('integration_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', mysql.VARCHAR(length=36), nullable=False),
+    sa.Column('integration_type', sa.Enum('ZOHO', 'QUICKBOOKS', 'XERO', name='integrationtype'), nullable=False),
+    sa.Column('access_token', sa.Text(), nullable=False),
+    sa.Column('refresh_token', sa.Text(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('org_id', sa.String(length=255), nullable=True),
+    sa.Column('tenant_id_external', sa.String(length=255), nullable=True),
+    sa.Column('additional_data', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_integration_keys_id'), 'integration_keys', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', mysql.VARCHAR(length=36), nullable=False),
+    sa.Column('cognito_id', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('role', sa.Enum('ADMIN', 'USER', 'VIEWER', name='userrole'), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'INACTIVE', 'PENDING_CONFIRMATION', name='userstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cognito_id')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_integration_keys_id'), table_name='integration_keys')
+    op.drop_table('integration_keys')
+    op.drop_table('tenants')
     # ### end Alembic commands ###
@@ -0,0 +1,41 @@
+"""Store enum columns as SMALLINT codes
+
+Revision ID: c4e8a2f6b9d1
+Revises: b7c2d9e4f1a6
+Create Date: 2026-10-15 11:26:14.870352
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2f6b9d1'
+down_revision = 'b7c2d9e4f1a6'
+branch_labels = None
+depends_on = None
+
+# (table, column, member names in code order) as persisted by the old ENUM columns
+ENUM_COLUMNS = (
+    ('tenants', 'business_type', ('SOLE_PROPRIETOR', 'LLC', 'CORPORATION', 'PARTNERSHIP', 'OTHER')),
+    ('users', 'role', ('ADMIN', 'USER', 'VIEWER')),
+    ('users', 'status', ('ACTIVE', 'INACTIVE', 'PENDING_CONFIRMATION')),
+    ('integration_keys', 'integration_type', ('ZOHO', 'QUICKBOOKS', 'XERO')),
+)
+
+
+def upgrade() -> None:
+    for table, column, names in ENUM_COLUMNS:
+        cases = " ".join(f"WHEN '{name}' THEN '{code}'" for code, name in enumerate(names))
+        op.alter_column(table, column, existing_type=mysql.ENUM(*names), type_=sa.String(32), existing_nullable=False)
+        op.execute(f"UPDATE {table} SET {column} = CASE {column} {cases} END")
+        op.alter_column(table, column, existing_type=sa.String(32), type_=sa.SmallInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    for table, column, names in ENUM_COLUMNS:
+        cases = " ".join(f"WHEN {code} THEN '{name}'" for code, name in enumerate(names))
+        op.alter_column(table, column, existing_type=sa.SmallInteger(), type_=sa.String(32), existing_nullable=False)
+        op.execute(f"UPDATE {table} SET {column} = CASE {column} {cases} END")
+        op.alter_column(table, column, existing_type=sa.String(32), type_=mysql.ENUM(*names), existing_nullable=False)
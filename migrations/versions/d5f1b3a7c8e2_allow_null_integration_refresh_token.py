@@ -0,0 +1,25 @@
+"""Allow NULL integration_keys.refresh_token for paired token storage
+
+Revision ID: d5f1b3a7c8e2
+Revises: c4e8a2f6b9d1
+Create Date: 2026-10-15 14:37:05.118263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f1b3a7c8e2'
+down_revision = 'c4e8a2f6b9d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column('integration_keys', 'refresh_token', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    # Paired rows cannot be split without the encryption key; they must be re-stored first
+    op.alter_column('integration_keys', 'refresh_token', existing_type=sa.Text(), nullable=False)
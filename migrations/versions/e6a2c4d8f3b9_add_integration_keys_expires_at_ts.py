@@ -0,0 +1,27 @@
+"""Add integration_keys.expires_at_ts epoch column
+
+Revision ID: e6a2c4d8f3b9
+Revises: d5f1b3a7c8e2
+Create Date: 2026-10-15 15:02:41.730586
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a2c4d8f3b9'
+down_revision = 'd5f1b3a7c8e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('integration_keys', sa.Column('expires_at_ts', sa.BigInteger(), nullable=True))
+    # expires_at holds UTC wall time; TIMESTAMPDIFF avoids UNIX_TIMESTAMP's session time zone
+    op.execute("UPDATE integration_keys SET expires_at_ts = TIMESTAMPDIFF(SECOND, '1970-01-01 00:00:00', expires_at)")
+    op.alter_column('integration_keys', 'expires_at_ts', existing_type=sa.BigInteger(), nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('integration_keys', 'expires_at_ts')
@@ -0,0 +1,27 @@
+"""Store encrypted integration tokens as BLOB
+
+Revision ID: f7b3d5e9a1c4
+Revises: e6a2c4d8f3b9
+Create Date: 2026-10-15 16:11:28.590437
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b3d5e9a1c4'
+down_revision = 'e6a2c4d8f3b9'
+branch_labels = None
+depends_on = None
+
+
+# Fernet tokens are ASCII, so the stored bytes are unchanged in both directions
+def upgrade() -> None:
+    op.alter_column('integration_keys', 'access_token', existing_type=sa.Text(), type_=sa.LargeBinary(), existing_nullable=False)
+    op.alter_column('integration_keys', 'refresh_token', existing_type=sa.Text(), type_=sa.LargeBinary(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('integration_keys', 'access_token', existing_type=sa.LargeBinary(), type_=sa.Text(), existing_nullable=False)
+    op.alter_column('integration_keys', 'refresh_token', existing_type=sa.LargeBinary(), type_=sa.Text(), existing_nullable=True)
@@ -10,9 +10,9 @@ from app.core.config import get_settings
 from sqlalchemy import create_engine
 
 def reset_database():
-    # Create engine with echo for logging SQL commands
+    # Engine starts quiet for the drop phase; SQL echo is enabled for table creation
     db_url = get_settings().database_url
-    engine = create_engine(db_url, echo=True)
+    engine = create_engine(db_url, echo=False)
     
     print("Dropping all tables...")
     # Use raw SQL to drop all tables in the correct order (handling foreign keys)
@@ -23,13 +23,14 @@ def reset_database():
         result = conn.execute(text("SHOW TABLES"))
         tables = [row[0] for row in result]
         
-        # Drop each table
-        for table in tables:
-            print(f"Dropping table: {table}")
-            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        # Drop every table in a single statement
+        if tables:
+            print(f"Dropping tables: {', '.join(tables)}")
+            conn.execute(text(f"DROP TABLE IF EXISTS {', '.join(f'`{table}`' for table in tables)}"))
             
         conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
     
+    engine.echo = True
     print("Creating all tables from models...")
     # Create all tables based on models
     Base.metadata.create_all(bind=engine)
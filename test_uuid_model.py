@@ -1,7 +1,7 @@
 """
 Simple test script to verify UUID generation and model relationships
 """
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.db.session import SessionLocal, engine
 from app.db.models import generate_uuid, Tenant, User, BusinessType, UserRole, UserStatus
 
@@ -57,7 +57,8 @@ def test_uuid_models():
         print(f"\nVerifying tenant ID link: {user.tenant_id == tenant.id}")
         
         # Query to verify relationship works
-        test_user = db.query(User).filter(User.id == user.id).first()
+        # Load the tenant in the same SELECT rather than lazily on first access
+        test_user = db.query(User).options(joinedload(User.tenant)).filter(User.id == user.id).first()
         print(f"\nVerifying tenant relationship: {test_user.tenant.business_name == tenant.business_name}")
         
     finally: